@@ -1,6 +1,8 @@
 # backtester.py
+import itertools
 import pandas as pd
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from enhanced_strategy import EnhancedStrategy
 from risk_manager import RiskManager
@@ -10,7 +12,13 @@ class Backtester:
         self.initial_balance = initial_balance
         self.results = {}
         
-    def run_backtest(self, historical_data: pd.DataFrame, strategy_params: Dict = None) -> Dict[str, Any]:
+    def run_backtest(self, historical_data: pd.DataFrame, strategy_params: Dict = None,
+                     indicators: Optional[Dict[str, np.ndarray]] = None, close_at_end: bool = False) -> Dict[str, Any]:
+        """Replay historical_data through an EnhancedStrategy.
+
+        `indicators` may hold precomputed 'fast_ema', 'slow_ema' and 'rsi' arrays aligned
+        with the rows of historical_data; `close_at_end` closes open trades at the last price.
+        """
         if strategy_params is None:
             strategy_params = {}
             
@@ -23,25 +31,27 @@ class Backtester:
         trades = []
         equity_curve = [self.initial_balance]
         
-        for i, price in enumerate(prices):
+        if indicators is not None:
+            columns = [np.asarray(indicators[key]) for key in ('fast_ema', 'slow_ema', 'rsi')]
+            if any(len(column) != len(prices) for column in columns):
+                raise ValueError(f"Indicator arrays must have {len(prices)} values, got "
+                                 f"{[len(column) for column in columns]}")
+            precomputed = zip(*(column.tolist() for column in columns))
+        else:
+            precomputed = itertools.repeat(None)
+        
+        for i, (price, values) in enumerate(zip(prices, precomputed)):
             # Run strategy
-            signals = strategy.on_price(price)
+            signals = strategy.on_price(price, values)
             
             # Record equity
-            current_equity = strategy.risk_manager.account_balance
-            if strategy.risk_manager.open_trades:
-                # Include unrealized PnL
-                for trade in strategy.risk_manager.open_trades:
-                    if trade.signal == "BUY":
-                        unrealized = (price - trade.entry_price) * trade.quantity * 10000
-                    else:
-                        unrealized = (trade.entry_price - price) * trade.quantity * 10000
-                    current_equity += unrealized
+            # Include unrealized PnL
+            current_equity = strategy.risk_manager.account_balance + strategy.risk_manager.unrealized_pnl(price)
                     
             equity_curve.append(current_equity)
             
             # Record trade if signal generated
-            if signals and "BUY" in signals[0] or "SELL" in signals[0]:
+            if signals and ("BUY" in signals[0] or "SELL" in signals[0]):
                 trades.append({
                     'timestamp': timestamps[i] if i < len(timestamps) else datetime.now(),
                     'price': price,
@@ -49,6 +59,10 @@ class Backtester:
                     'equity': current_equity
                 })
         
+        if close_at_end and prices and strategy.risk_manager.open_trades:
+            strategy.risk_manager.close_trade_manually(prices[-1])
+            equity_curve[-1] = strategy.risk_manager.account_balance
+        
         # Calculate metrics
         perf_metrics = strategy.get_strategy_stats()
         perf_metrics['final_balance'] = strategy.risk_manager.account_balance
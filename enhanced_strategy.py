@@ -1,21 +1,28 @@
 # enhanced_strategy.py - FIXED VERSION
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import math
 from bot import PriceCrossBot
-from indicators import ema, rsi, get_all_indicators
+from indicators import ema_np, rsi
 from risk_manager import RiskManager
 
 class EnhancedStrategy:
-    def __init__(self, fast_period: int = 13, slow_period: int = 20, rsi_period: int = 14):
+    def __init__(self, fast_period: int = 13, slow_period: int = 20, rsi_period: int = 14,
+                 risk_params: Optional[Dict[str, Any]] = None, trade_log_file: str = "trade_log.csv"):
         self.fast_period = fast_period
         self.slow_period = slow_period
         self.rsi_period = rsi_period
         self.prices: List[float] = []
         self.position: str = None
-        self.bot = PriceCrossBot()
-        self.risk_manager = RiskManager()
+        self.bot = PriceCrossBot(trade_log_file)
+        self.risk_manager = RiskManager(**(risk_params or {}))
         self.signal_history: List[Dict] = []
 
-    def on_price(self, price: float) -> List[str]:
+    def on_price(self, price: float, indicators: Optional[Tuple[float, float, float]] = None) -> List[str]:
+        """Process one price; `indicators` may supply precomputed (fast_ema, slow_ema, rsi) values.
+
+        Precomputed values replace the price-count warm-up check: they are expected to be
+        NaN until warm, so a window cut from the middle of a history can trade at once.
+        """
         self.prices.append(price)
         signals = []
 
@@ -27,14 +34,16 @@ class EnhancedStrategy:
             # Update position when trade closes
             self.position = None
 
-        if len(self.prices) < max(self.slow_period, self.rsi_period) + 1:
-            return signals
-
         # Get all indicators
-        fast_ema = ema(self.prices, self.fast_period)[-1]
-        slow_ema = ema(self.prices, self.slow_period)[-1]
-        current_rsi = rsi(self.prices, self.rsi_period)[-1]
-        indicators = get_all_indicators(self.prices)
+        if indicators is not None:
+            fast_ema, slow_ema, current_rsi = indicators
+            if math.isnan(fast_ema) or math.isnan(slow_ema) or math.isnan(current_rsi):
+                return signals
+        else:
+            if len(self.prices) < max(self.slow_period, self.rsi_period) + 1:
+                return signals
+            fast_ema, slow_ema = ema_np(self.prices, (self.fast_period, self.slow_period))[:, -1]
+            current_rsi = rsi(self.prices, self.rsi_period)[-1]
 
         # Trading logic
         ema_bullish = fast_ema > slow_ema
@@ -0,0 +1,217 @@
+# fanout.py - multi-process live fan-out over a shared-memory tick ring
+import os
+import queue
+import threading
+import multiprocessing as mp
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from data import stream_prices
+from enhanced_strategy import EnhancedStrategy
+from tick_ring import TickRing, TickReader
+
+DEFAULT_PARAM_SETS: List[Dict[str, Any]] = [
+    {"fast_period": 8, "slow_period": 21, "rsi_period": 14},
+    {"fast_period": 13, "slow_period": 20, "rsi_period": 14},
+    {"fast_period": 13, "slow_period": 34, "rsi_period": 14},
+    {"fast_period": 21, "slow_period": 55, "rsi_period": 14},
+]
+
+
+def strategy_label(params: Dict[str, Any]) -> str:
+    label = f"EMA {params.get('fast_period', 13)}/{params.get('slow_period', 20)} RSI {params.get('rsi_period', 14)}"
+    risk = params.get("risk_params") or {}
+    extras = [f"{key}={value}" for key, value in sorted(risk.items()) if key != "pnl_file"]
+    return f"{label} ({', '.join(extras)})" if extras else label
+
+
+def run_feed(ring_name: str, symbol: str, interval: int, stop_event, ready_barrier=None,
+             replay: Optional[Sequence[float]] = None):
+    """Feed process: write ticks from data.py (or a replayed price list) into the ring"""
+    ring = TickRing.attach(ring_name)
+    try:
+        if ready_barrier is not None:
+            try:
+                ready_barrier.wait(timeout=60)
+            except threading.BrokenBarrierError:
+                print("⚠️ Not all workers attached, starting feed anyway")
+
+        if replay is not None:
+            for price in replay:
+                if stop_event.is_set():
+                    break
+                ring.write(price)
+        else:
+            for prev_price, price in stream_prices(symbol, interval):
+                ring.write(price)
+                if stop_event.is_set():
+                    break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close_feed()
+        ring.close()
+
+
+def _worker_report(worker_id: int, reader: TickReader, ticks: int,
+                   strategies: List[Tuple[int, str, EnhancedStrategy]], final: bool) -> Dict[str, Any]:
+    return {
+        "worker": worker_id,
+        "final": final,
+        "ticks": ticks,
+        "last_seq": reader.next_seq - 1,
+        "overruns": reader.overruns,
+        "dropped": reader.dropped,
+        "strategies": {index: dict(strategy.get_strategy_stats(), label=label)
+                       for index, label, strategy in strategies},
+    }
+
+
+def run_worker(worker_id: int, ring_name: str, param_sets: Sequence[Tuple[int, Dict[str, Any]]],
+               stats_queue, stop_event, ready_barrier=None, warmup: Sequence[float] = (),
+               log_dir: str = ".", report_every: int = 0, verbose: bool = True):
+    """Worker process: run a group of strategies on every tick read from the ring"""
+    ring = TickRing.attach(ring_name)
+    reader = TickReader(ring)
+    strategies: List[Tuple[int, str, EnhancedStrategy]] = []
+    for index, params in param_sets:
+        params = dict(params)
+        risk_params = dict(params.get("risk_params") or {})
+        risk_params.setdefault("pnl_file", os.path.join(log_dir, f"pnl_tracking_{index}.csv"))
+        params["risk_params"] = risk_params
+        params.setdefault("trade_log_file", os.path.join(log_dir, f"trade_log_{index}.csv"))
+        strategy = EnhancedStrategy(**params)
+        strategy.prices.extend(warmup)
+        strategies.append((index, strategy_label(params), strategy))
+
+    ticks = 0
+    try:
+        if ready_barrier is not None:
+            try:
+                ready_barrier.wait(timeout=60)
+            except threading.BrokenBarrierError:
+                # The reader starts from sequence 0, so it still sees every tick the ring kept
+                print(f"⚠️ Worker {worker_id}: not all processes attached, reading ticks anyway", flush=True)
+        for seq, timestamp, price in reader.ticks(stop_event=stop_event):
+            for _, label, strategy in strategies:
+                for s in strategy.on_price(price):
+                    if verbose:
+                        print(f"[{datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')}] [{label}] {s}", flush=True)
+            ticks += 1
+            if report_every and ticks % report_every == 0:
+                stats_queue.put(_worker_report(worker_id, reader, ticks, strategies, final=False))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats_queue.put(_worker_report(worker_id, reader, ticks, strategies, final=True))
+        ring.close()
+
+
+def aggregate_stats(reports: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the latest report of every worker into one view.
+
+    Strategies are keyed by their index in the param set list, since two param sets
+    can share a label; the label is kept in each entry for display.
+    """
+    strategies: Dict[int, Dict[str, Any]] = {}
+    for worker_id in sorted(reports):
+        for index, stats in reports[worker_id]["strategies"].items():
+            strategies[index] = dict(stats, worker=worker_id)
+    strategies = dict(sorted(strategies.items()))
+
+    return {
+        "workers": len(reports),
+        "strategies_running": len(strategies),
+        "ticks_processed": sum(r["ticks"] for r in reports.values()),
+        "overruns": sum(r["overruns"] for r in reports.values()),
+        "dropped_ticks": sum(r["dropped"] for r in reports.values()),
+        "total_trades": sum(s.get("total_trades", 0) for s in strategies.values()),
+        "open_trades": sum(s.get("open_trades", 0) for s in strategies.values()),
+        "total_pnl": round(sum(s.get("total_pnl", 0) for s in strategies.values()), 2),
+        "strategies": strategies,
+    }
+
+
+def format_stats(aggregated: Dict[str, Any]) -> str:
+    lines = [
+        f"📊 {aggregated['strategies_running']} strategies on {aggregated['workers']} workers | "
+        f"Ticks: {aggregated['ticks_processed']} | Overruns: {aggregated['overruns']} "
+        f"({aggregated['dropped_ticks']} dropped) | Trades: {aggregated['total_trades']} | "
+        f"Total PnL: ${aggregated['total_pnl']:.2f}"
+    ]
+    for stats in aggregated["strategies"].values():
+        lines.append(
+            f"   [{stats['label']}] worker {stats['worker']} | Trades: {stats.get('total_trades', 0)} | "
+            f"Win Rate: {stats.get('win_rate', 0):.1f}% | PnL: ${stats.get('total_pnl', 0):.2f}"
+        )
+    return "\n".join(lines)
+
+
+def _collect(stats_queue, workers, reports: Dict[int, Dict[str, Any]], finished: set,
+             on_report: Optional[Callable[[Dict[str, Any]], None]] = None):
+    while len(finished) < len(workers):
+        try:
+            report = stats_queue.get(timeout=0.5)
+        except queue.Empty:
+            if not any(p.is_alive() for p in workers):
+                return
+            continue
+        reports[report["worker"]] = report
+        if report["final"]:
+            finished.add(report["worker"])
+        elif on_report is not None:
+            on_report(aggregate_stats(reports))
+
+
+def run_fanout(symbol: str = "EURUSD=X", interval: int = 1,
+               param_sets: Optional[Sequence[Dict[str, Any]]] = None, n_workers: Optional[int] = None,
+               capacity: int = 4096, warmup: Sequence[float] = (), replay: Optional[Sequence[float]] = None,
+               log_dir: str = ".", report_every: int = 0, verbose: bool = True,
+               on_report: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Start one feed process and n_workers strategy processes sharing a tick ring.
+
+    Strategies are dealt round-robin to workers. Returns the aggregated final stats.
+    """
+    param_sets = list(param_sets or DEFAULT_PARAM_SETS)
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(param_sets)))
+    indexed = list(enumerate(param_sets))
+
+    ctx = mp.get_context("spawn")
+    ring = TickRing.create(capacity)
+    stop_event = ctx.Event()
+    ready_barrier = ctx.Barrier(n_workers + 1)
+    stats_queue = ctx.Queue()
+
+    workers = [
+        ctx.Process(target=run_worker, name=f"fanout-worker-{worker_id}",
+                    args=(worker_id, ring.name, indexed[worker_id::n_workers], stats_queue, stop_event,
+                          ready_barrier, list(warmup), log_dir, report_every, verbose))
+        for worker_id in range(n_workers)
+    ]
+    feed = ctx.Process(target=run_feed, name="fanout-feed",
+                       args=(ring.name, symbol, interval, stop_event, ready_barrier,
+                             list(replay) if replay is not None else None))
+
+    reports: Dict[int, Dict[str, Any]] = {}
+    finished: set = set()
+    try:
+        for process in workers:
+            process.start()
+        feed.start()
+        try:
+            _collect(stats_queue, workers, reports, finished, on_report)
+        except KeyboardInterrupt:
+            # Workers got the interrupt too; wait for their final reports
+            stop_event.set()
+            _collect(stats_queue, workers, reports, finished)
+    finally:
+        stop_event.set()
+        for process in workers + [feed]:
+            if process.pid is None:
+                continue
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        ring.close()
+
+    return aggregate_stats(reports)
@@ -1,43 +1,263 @@
 # indicators.py - FIXED RSI CALCULATION
-import pandas as pd
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Sequence, Tuple, Union
+
+Periods = Union[int, Sequence[int]]
+
+# Block length used by the EMA scan; each block is solved with one matmul
+_EMA_BLOCK = 64
+# Windows per chunk when computing rolling standard deviations
+_STD_CHUNK = 16384
+
+
+def _as_array(prices) -> np.ndarray:
+    """View prices (ndarray, memoryview, list) as a float64 array, copying only if needed"""
+    return np.asarray(prices, dtype=np.float64)
+
+
+def _as_periods(periods: Periods) -> Tuple[np.ndarray, bool]:
+    """Normalise periods to an int array and remember whether a scalar was passed"""
+    scalar = np.ndim(periods) == 0
+    arr = np.atleast_1d(np.asarray(periods, dtype=np.int64))
+    if arr.size == 0 or (arr < 1).any():
+        raise ValueError(f"Periods must be positive integers, got {periods!r}")
+    return arr, scalar
+
+
+def _ema_weights(alphas: np.ndarray, block: int) -> Tuple[np.ndarray, np.ndarray]:
+    """In-block weights (k, block, block) and carry weights (k, block) for the EMA recursion"""
+    decay = 1.0 - alphas
+    lag = np.arange(block)[:, None] - np.arange(block)[None, :]
+    weights = np.where(lag >= 0, alphas[:, None, None] * decay[:, None, None] ** np.maximum(lag, 0), 0.0)
+    carry_weights = decay[:, None] ** np.arange(1, block + 1)
+    return weights, carry_weights
+
+
+def _ema_blocks(x: np.ndarray, carry: np.ndarray, weights: np.ndarray, carry_weights: np.ndarray) -> np.ndarray:
+    """Continue the recursion over a NaN-free x from the previous values in carry.
+
+    The series is cut into blocks; the in-block part of the recursion is a single
+    batched matmul and only the carry between blocks is a Python loop.
+    """
+    n = x.shape[0]
+    block = weights.shape[1]
+    if n == 0:
+        return np.empty((carry.shape[0], 0))
+    n_blocks = -(-n // block)
+    pad = n_blocks * block - n
+    blocks = np.concatenate([x, np.full(pad, x[-1])]) if pad else x
+    out = np.matmul(blocks.reshape(n_blocks, block), weights.swapaxes(1, 2))  # (k, n_blocks, block)
+
+    for b in range(n_blocks):
+        out[:, b, :] += carry_weights * carry[:, None]
+        carry = out[:, b, -1]
+    return out.reshape(carry.shape[0], n_blocks * block)[:, :n]
+
+
+def _ema_scan(x: np.ndarray, alphas: np.ndarray) -> np.ndarray:
+    """Recursive EMA y[t] = a*x[t] + (1-a)*y[t-1], seeded with x[0], for every alpha at once.
+
+    NaN is handled like pandas ewm(adjust=False, ignore_na=False): leading NaNs stay
+    NaN, gaps repeat the previous value, and the first observation after a gap of g
+    bars is blended as (w*y + a*x) / (w + a) with w = (1-a)^(g+1). Each NaN-free
+    segment is scanned in blocks, so Python only loops over the gaps.
+    """
+    n = x.shape[0]
+    k = alphas.shape[0]
+    if n == 0:
+        return np.empty((k, 0))
+    weights, carry_weights = _ema_weights(alphas, min(_EMA_BLOCK, n))
+    missing = np.isnan(x)
+    if not missing.any():
+        return _ema_blocks(x, np.full(k, x[0]), weights, carry_weights)
+
+    out = np.full((k, n), np.nan)
+    observed = np.flatnonzero(~missing)
+    if observed.size == 0:
+        return out
+    breaks = np.flatnonzero(np.diff(observed) > 1)
+    starts = observed[np.concatenate(([0], breaks + 1))].tolist()
+    ends = (observed[np.concatenate((breaks, [observed.size - 1]))] + 1).tolist()
+
+    decay = 1.0 - alphas
+    value = None
+    prev_end = 0
+    for start, end in zip(starts, ends):
+        if value is None:
+            value = np.full(k, x[start])
+        else:
+            out[:, prev_end:start] = value[:, None]
+            old_weight = decay ** (start - prev_end + 1)
+            value = (old_weight * value + alphas * x[start]) / (old_weight + alphas)
+        out[:, start] = value
+        if end - start > 1:
+            out[:, start + 1:end] = _ema_blocks(x[start + 1:end], value, weights, carry_weights)
+            value = out[:, end - 1]
+        prev_end = end
+    out[:, prev_end:] = value[:, None]
+    return out
+
+
+def _rolling_sums(x: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """Trailing window sums for every period from one cumulative sum.
+
+    NaN during warm-up and for windows that contain a NaN, as with pandas rolling.
+    """
+    n = x.shape[0]
+    missing = np.isnan(x)
+    has_missing = bool(missing.any())
+    csum = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, x))))
+    out = np.full((periods.shape[0], n), np.nan)
+    if has_missing:
+        nan_count = np.concatenate(([0], np.cumsum(missing)))
+    for row, p in enumerate(periods):
+        if p <= n:
+            out[row, p - 1:] = csum[p:] - csum[:n - p + 1]
+            if has_missing:
+                out[row, p - 1:][nan_count[p:] - nan_count[:n - p + 1] > 0] = np.nan
+    return out
+
+
+def _offset(x: np.ndarray) -> float:
+    """First finite value, used to shift prices so cumulative sums stay small and precise"""
+    finite = np.flatnonzero(np.isfinite(x))
+    return float(x[finite[0]]) if finite.size else 0.0
+
+
+def _rolling_mean(x: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    offset = _offset(x)
+    return _rolling_sums(x - offset, periods) / periods[:, None] + offset
+
+
+def _rolling_std(x: np.ndarray, period: int) -> np.ndarray:
+    """Population std of each trailing window, two-pass within the window.
+
+    Unlike E[x^2] - E[x]^2 from running sums, the error doesn't grow with history length.
+    Windows are processed in chunks to bound the temporary (chunk, period) arrays.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if period > n:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(x, period)
+    for start in range(0, windows.shape[0], _STD_CHUNK):
+        chunk = windows[start:start + _STD_CHUNK]
+        deviations = chunk - chunk.mean(axis=1, keepdims=True)
+        out[period - 1 + start:period - 1 + start + chunk.shape[0]] = np.sqrt((deviations * deviations).mean(axis=1))
+    return out
+
+
+def ema_np(prices, periods: Periods = 14) -> np.ndarray:
+    """EMA (span convention, adjust=False) for one period (1D) or many periods (2D, one row each)"""
+    x = _as_array(prices)
+    p, scalar = _as_periods(periods)
+    out = _ema_scan(x, 2.0 / (p + 1.0))
+    return out[0] if scalar else out
+
+
+def sma_np(prices, periods: Periods = 14) -> np.ndarray:
+    """Simple moving average; the first period-1 values of each row are NaN"""
+    x = _as_array(prices)
+    p, scalar = _as_periods(periods)
+    out = _rolling_mean(x, p)
+    return out[0] if scalar else out
+
+
+def rsi_np(prices, periods: Periods = 14) -> np.ndarray:
+    """RSI from simple averages of gains and losses; NaN during warm-up, 50 on a flat window"""
+    x = _as_array(prices)
+    p, scalar = _as_periods(periods)
+    n = x.shape[0]
+    out = np.full((p.shape[0], n), np.nan)
+    if n == 0:
+        return out[0] if scalar else out
+
+    delta = np.diff(x, prepend=x[0])
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    gain_sums = _rolling_sums(gains, p)
+    loss_sums = _rolling_sums(losses, p)
+    # Windows without any move are forced to exactly zero so cumsum noise can't fake a trend
+    gain_sums[_rolling_sums((gains > 0).astype(np.float64), p) == 0] = 0.0
+    loss_sums[_rolling_sums((losses > 0).astype(np.float64), p) == 0] = 0.0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain_sums / loss_sums
+        out = 100.0 - 100.0 / (1.0 + rs)
+    no_loss = loss_sums == 0
+    out[no_loss] = np.where(gain_sums[no_loss] > 0, 100.0, 50.0)
+    return out[0] if scalar else out
+
+
+def atr_np(high, low, close, periods: Periods = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing (alpha = 1/period), seeded with the first range"""
+    h = _as_array(high)
+    l = _as_array(low)
+    c = _as_array(close)
+    p, scalar = _as_periods(periods)
+    if c.shape[0] == 0:
+        out = np.empty((p.shape[0], 0))
+        return out[0] if scalar else out
+
+    prev_close = np.concatenate(([c[0]], c[:-1]))
+    true_range = np.maximum(h - l, np.maximum(np.abs(h - prev_close), np.abs(l - prev_close)))
+    true_range[0] = h[0] - l[0]
+    out = _ema_scan(true_range, 1.0 / p)
+    return out[0] if scalar else out
+
+
+def bollinger_np(prices, periods: Periods = 20, num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands (middle, upper, lower) using the population standard deviation"""
+    x = _as_array(prices)
+    p, scalar = _as_periods(periods)
+    middle = _rolling_mean(x, p)
+    std = np.full_like(middle, np.nan)
+    for row, period in enumerate(p):
+        std[row] = _rolling_std(x, int(period))
+    upper = middle + num_std * std
+    lower = middle - num_std * std
+    if scalar:
+        return middle[0], upper[0], lower[0]
+    return middle, upper, lower
+
+
+def macd_np(prices, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram; both EMAs come from a single scan"""
+    x = _as_array(prices)
+    fast_ema, slow_ema = ema_np(x, (fast, slow))
+    macd_line = fast_ema - slow_ema
+    signal_line = ema_np(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+# List-based wrappers kept for existing strategies
 
 def ema(prices: List[float], period: int = 14) -> List[float]:
     if not prices or len(prices) < period:
         return [0.0] * len(prices) if prices else []
-    prices = pd.Series(prices)
-    return prices.ewm(span=period, adjust=False).mean().tolist()
+    return ema_np(prices, period).tolist()
 
 def sma(prices: List[float], period: int = 14) -> List[float]:
     if len(prices) < period:
         return [0.0] * len(prices)
-    prices = pd.Series(prices)
-    return prices.rolling(window=period).mean().tolist()
+    return sma_np(prices, period).tolist()
 
 def rsi(prices: List[float], period: int = 14) -> List[float]:
     if len(prices) < period + 1:
         return [50.0] * len(prices)  # Default to neutral RSI
-    
-    prices_series = pd.Series(prices)
-    delta = prices_series.diff()
-    
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    
-    rs = gain / loss
-    rsi_series = 100 - (100 / (1 + rs))
-    
-    # Fill NaN values with 50 (neutral)
-    return rsi_series.fillna(50).tolist()
+
+    # Fill warm-up NaN values with 50 (neutral)
+    return np.nan_to_num(rsi_np(prices, period), nan=50.0).tolist()
 
 def get_all_indicators(prices: List[float]) -> Dict[str, float]:
     if len(prices) < 26:
         return {"ema_12": 0, "ema_26": 0, "sma_20": 0, "rsi": 50}
-    
+
+    x = _as_array(prices)
+    ema_12, ema_26 = ema_np(x, (12, 26))[:, -1]
     return {
-        "ema_12": ema(prices, 12)[-1],
-        "ema_26": ema(prices, 26)[-1],
-        "sma_20": sma(prices, 20)[-1],
-        "rsi": rsi(prices, 14)[-1]
-    }
\ No newline at end of file
+        "ema_12": float(ema_12),
+        "ema_26": float(ema_26),
+        "sma_20": float(sma_np(x, 20)[-1]),
+        "rsi": float(np.nan_to_num(rsi_np(x, 14)[-1], nan=50.0))
+    }
@@ -4,13 +4,19 @@ import argparse
 from data import stream_prices, get_historical_data
 from enhanced_strategy import EnhancedStrategy
 from backtester import Backtester
+from fanout import run_fanout, format_stats, DEFAULT_PARAM_SETS
+from walk_forward import WalkForward, DEFAULT_PARAM_GRID
 
 def main():
     parser = argparse.ArgumentParser(description='Forex Trading Bot')
-    parser.add_argument('--mode', choices=['live', 'backtest'], default='live', help='Run mode')
+    parser.add_argument('--mode', choices=['live', 'backtest', 'fanout', 'walkforward'], default='live', help='Run mode')
     parser.add_argument('--symbol', default='EURUSD=X', help='Trading symbol')
     parser.add_argument('--interval', type=int, default=1, help='Price check interval (seconds)')
     parser.add_argument('--period', default='7d', help='Historical data period for backtesting')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for fanout/walkforward modes (default: CPU count)')
+    parser.add_argument('--train-bars', type=int, default=2000, help='Walk-forward training window length (bars)')
+    parser.add_argument('--test-bars', type=int, default=500, help='Walk-forward test window length (bars)')
+    parser.add_argument('--anchored', action='store_true', help='Grow walk-forward training windows from the start of history')
     
     args = parser.parse_args()
     
@@ -34,6 +40,36 @@ def main():
         
         print(backtester.generate_report())
         
+    elif args.mode == 'walkforward':
+        print("🔁 Running Walk-Forward Optimization...")
+        historical_data = get_historical_data(SYMBOL, period=args.period, interval="1m")
+        
+        if historical_data.empty:
+            print("❌ No historical data available")
+            return
+            
+        walk_forward = WalkForward(train_size=args.train_bars, test_size=args.test_bars,
+                                   anchored=args.anchored, initial_balance=10000.0, n_jobs=args.workers)
+        try:
+            walk_forward.run(historical_data, DEFAULT_PARAM_GRID)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
+        print(walk_forward.generate_report())
+        
+    elif args.mode == 'fanout':
+        print(f"🚀 Fan-out mode: {len(DEFAULT_PARAM_SETS)} strategies over a shared tick ring")
+        historical_data = get_historical_data(SYMBOL, period="1d", interval="1m")
+        warmup = historical_data['Close'].tolist()[-100:] if not historical_data.empty else []
+        print(f"✅ Loaded {len(warmup)} historical prices")
+        
+        results = run_fanout(SYMBOL, INTERVAL, DEFAULT_PARAM_SETS, n_workers=args.workers,
+                             warmup=warmup, report_every=10, on_report=lambda stats: print(format_stats(stats)))
+        print("\n🛑 Bot stopped.")
+        print("📊 Final Performance Report:")
+        print(format_stats(results))
+        
     else:  # Live trading
         strategy = EnhancedStrategy(fast_period=13, slow_period=20, rsi_period=14)
         print("🎯 Enhanced Strategy Active (EMA 13/20 + RSI 14 + Risk Management)")
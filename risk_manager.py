@@ -1,39 +1,196 @@
 # risk_manager.py - FIXED VERSION
 import csv
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+import numpy as np
+
+SIDES = {"BUY": 1, "SELL": -1}
+STATUSES = ["OPEN", "CLOSED", "STOP_LOSS", "TAKE_PROFIT"]
+
+
+def _format_time(epoch: float) -> Optional[str]:
+    if np.isnan(epoch):
+        return None
+    return datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _format_times(epochs: List[float]) -> List[Optional[str]]:
+    """Format many epoch timestamps, formatting each distinct second only once"""
+    formatted: Dict[int, str] = {}
+    out = []
+    for epoch in epochs:
+        if epoch != epoch:
+            out.append(None)
+            continue
+        second = int(epoch)
+        if second not in formatted:
+            formatted[second] = _format_time(second)
+        out.append(formatted[second])
+    return out
+
+
+class TradeBook:
+    """Columnar store of trades: one typed array per field, grown by doubling.
+
+    Times are epoch seconds (NaN while unset), sides are +1/-1 and statuses are
+    indexes into `status_names`, so aggregate metrics run as numpy reductions.
+    The few fields checked on every bar are also kept as plain Python values in
+    `open_rows` while a trade is open, since numpy scalar reads are slow per bar.
+    """
+
+    FLOAT_COLUMNS = ("entry_time", "exit_time", "entry_price", "exit_price", "quantity",
+                     "stop_loss", "take_profit", "pnl", "pnl_percent")
+    OPEN_FIELDS = ("side", "entry_price", "quantity", "stop_loss", "take_profit")
+
+    def __init__(self, capacity: int = 256):
+        self.size = 0
+        self.status_names: List[str] = list(STATUSES)
+        self.side = np.zeros(capacity, dtype=np.int8)
+        self.status = np.zeros(capacity, dtype=np.int16)
+        self.open_rows: Dict[int, List[float]] = {}  # row -> OPEN_FIELDS values, in opening order
+        for name in self.FLOAT_COLUMNS:
+            setattr(self, name, np.full(capacity, np.nan))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self):
+        capacity = 2 * len(self.side)
+        for name in ("side", "status") + self.FLOAT_COLUMNS:
+            old = getattr(self, name)
+            new = np.full(capacity, np.nan) if old.dtype == np.float64 else np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def status_code(self, name: str) -> int:
+        if name not in self.status_names:
+            self.status_names.append(name)
+        return self.status_names.index(name)
+
+    def add(self, signal: str, entry_price: float, quantity: float, stop_loss: float,
+            take_profit: float, entry_time: Optional[float] = None) -> int:
+        if self.size == len(self.side):
+            self._grow()
+        i = self.size
+        self.side[i] = SIDES[signal]
+        self.status[i] = 0
+        self.entry_time[i] = time.time() if entry_time is None else entry_time
+        self.entry_price[i] = entry_price
+        self.quantity[i] = quantity
+        self.stop_loss[i] = stop_loss
+        self.take_profit[i] = take_profit
+        self.open_rows[i] = [SIDES[signal], float(entry_price), float(quantity), float(stop_loss), float(take_profit)]
+        self.size += 1
+        return i
+
+    def set(self, name: str, i: int, value: Optional[float]):
+        """Write one field, keeping the open-row copy in sync"""
+        getattr(self, name)[i] = np.nan if value is None else value
+        row = self.open_rows.get(i)
+        if row is not None and name in self.OPEN_FIELDS:
+            row[self.OPEN_FIELDS.index(name)] = value
+
+    def close(self, i: int, exit_price: float, reason: str, exit_time: Optional[float] = None) -> float:
+        """Close row i and return its PnL"""
+        pnl = self.side[i] * (exit_price - self.entry_price[i]) * self.quantity[i] * 10000
+        self.exit_time[i] = time.time() if exit_time is None else exit_time
+        self.exit_price[i] = exit_price
+        self.pnl[i] = pnl
+        self.pnl_percent[i] = (pnl / (self.entry_price[i] * self.quantity[i])) * 100
+        self.status[i] = self.status_code(reason)
+        self.open_rows.pop(i, None)
+        return float(pnl)
+
+    def closed_mask(self) -> np.ndarray:
+        return self.status[:self.size] != 0
+
+
+def _column(name: str, cast=float):
+    def getter(self):
+        value = getattr(self.book, name)[self.index]
+        return None if np.isnan(value) else cast(value)
+
+    def setter(self, value):
+        self.book.set(name, self.index, value)
+
+    return property(getter, setter)
+
 
-@dataclass
 class Trade:
-    entry_time: str
-    exit_time: Optional[str]
-    signal: str
-    entry_price: float
-    exit_price: Optional[float]
-    quantity: float
-    stop_loss: float
-    take_profit: float
-    pnl: Optional[float]
-    pnl_percent: Optional[float]
-    status: str  # OPEN, CLOSED, STOP_LOSS, TAKE_PROFIT
+    """Row view into a TradeBook with the attributes of the old Trade dataclass"""
+
+    __slots__ = ("book", "index")
+
+    def __init__(self, book: TradeBook, index: int):
+        self.book = book
+        self.index = index
+
+    entry_price = _column("entry_price")
+    exit_price = _column("exit_price")
+    quantity = _column("quantity")
+    stop_loss = _column("stop_loss")
+    take_profit = _column("take_profit")
+    pnl = _column("pnl")
+    pnl_percent = _column("pnl_percent")
+    entry_timestamp = _column("entry_time")
+    exit_timestamp = _column("exit_time")
+
+    @property
+    def entry_time(self) -> Optional[str]:
+        return _format_time(self.book.entry_time[self.index])
+
+    @property
+    def exit_time(self) -> Optional[str]:
+        return _format_time(self.book.exit_time[self.index])
+
+    @property
+    def signal(self) -> str:
+        return "BUY" if self.book.side[self.index] > 0 else "SELL"
+
+    @property
+    def status(self) -> str:
+        return self.book.status_names[self.book.status[self.index]]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Trade) and other.book is self.book and other.index == self.index
+
+    def __repr__(self) -> str:
+        return (f"Trade(entry_time={self.entry_time!r}, exit_time={self.exit_time!r}, signal={self.signal!r}, "
+                f"entry_price={self.entry_price}, exit_price={self.exit_price}, quantity={self.quantity}, "
+                f"stop_loss={self.stop_loss}, take_profit={self.take_profit}, pnl={self.pnl}, "
+                f"pnl_percent={self.pnl_percent}, status={self.status!r})")
+
 
 class RiskManager:
-    def __init__(self, risk_per_trade: float = 0.02, stop_loss_pips: float = 0.0020, take_profit_pips: float = 0.0040):
+    def __init__(self, risk_per_trade: float = 0.02, stop_loss_pips: float = 0.0020, take_profit_pips: float = 0.0040,
+                 pnl_file: Optional[str] = "pnl_tracking.csv", pnl_buffer_size: int = 100):
         self.risk_per_trade = risk_per_trade  # 2% risk per trade
         self.stop_loss_pips = stop_loss_pips  # 20 pips
         self.take_profit_pips = take_profit_pips  # 40 pips (1:2 risk-reward)
-        self.open_trades: List[Trade] = []
-        self.closed_trades: List[Trade] = []
+        self.book = TradeBook()
+        self._closed: List[int] = []  # book rows, in closing order
+        self._unlogged: List[int] = []  # closed rows not yet written to the PnL CSV
         self.account_balance = 10000.0  # Starting balance
         self.equity_curve = []
-        self.pnl_file = "pnl_tracking.csv"
+        self.pnl_file = pnl_file  # None disables PnL logging
+        self.pnl_buffer_size = pnl_buffer_size
         
         # Initialize PnL CSV
         self._init_pnl_csv()
     
+    @property
+    def open_trades(self) -> List[Trade]:
+        return [Trade(self.book, i) for i in self.book.open_rows]
+
+    @property
+    def closed_trades(self) -> List[Trade]:
+        return [Trade(self.book, i) for i in self._closed]
+
     def _init_pnl_csv(self):
         """Initialize PnL tracking CSV with headers"""
+        if self.pnl_file is None:
+            return
         try:
             with open(self.pnl_file, mode='w', newline='') as file:
                 writer = csv.DictWriter(file, fieldnames=[
@@ -44,8 +201,13 @@ class RiskManager:
         except Exception as e:
             print(f"Error initializing PnL CSV: {e}")
     
-    def _log_pnl(self, trade: Trade):
-        """Log closed trade to PnL CSV"""
+    def flush_pnl(self):
+        """Write buffered closed trades to the PnL CSV"""
+        if not self._unlogged:
+            return
+        rows, self._unlogged = self._unlogged, []
+        entry_times = _format_times(self.book.entry_time[rows].tolist())
+        exit_times = _format_times(self.book.exit_time[rows].tolist())
         try:
             with open(self.pnl_file, mode='a', newline='') as file:
                 writer = csv.DictWriter(file, fieldnames=[
@@ -53,18 +215,20 @@ class RiskManager:
                     "quantity", "pnl", "pnl_percent", "status"
                 ])
                 
-                trade_dict = {
-                    "entry_time": trade.entry_time,
-                    "exit_time": trade.exit_time or "",
-                    "signal": trade.signal,
-                    "entry_price": round(trade.entry_price, 5),
-                    "exit_price": round(trade.exit_price, 5) if trade.exit_price else "",
-                    "quantity": round(trade.quantity, 2),
-                    "pnl": round(trade.pnl, 2) if trade.pnl else "",
-                    "pnl_percent": round(trade.pnl_percent, 2) if trade.pnl_percent else "",
-                    "status": trade.status
-                }
-                writer.writerow(trade_dict)
+                for row, entry_time, exit_time in zip(rows, entry_times, exit_times):
+                    trade = Trade(self.book, row)
+                    trade_dict = {
+                        "entry_time": entry_time,
+                        "exit_time": exit_time or "",
+                        "signal": trade.signal,
+                        "entry_price": round(trade.entry_price, 5),
+                        "exit_price": round(trade.exit_price, 5) if trade.exit_price else "",
+                        "quantity": round(trade.quantity, 2),
+                        "pnl": round(trade.pnl, 2) if trade.pnl else "",
+                        "pnl_percent": round(trade.pnl_percent, 2) if trade.pnl_percent else "",
+                        "status": trade.status
+                    }
+                    writer.writerow(trade_dict)
         except Exception as e:
             print(f"Error logging PnL: {e}")
     
@@ -83,91 +247,78 @@ class RiskManager:
             stop_loss = price + self.stop_loss_pips
             take_profit = price - self.take_profit_pips
             
-        trade = Trade(
-            entry_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            exit_time=None,
-            signal=signal,
-            entry_price=price,
-            exit_price=None,
-            quantity=quantity,
-            stop_loss=stop_loss,
-            take_profit=take_profit,
-            pnl=None,
-            pnl_percent=None,
-            status="OPEN"
-        )
-        
-        self.open_trades.append(trade)
-        return trade
+        index = self.book.add(signal, price, quantity, stop_loss, take_profit)
+        return Trade(self.book, index)
     
     def check_exit_conditions(self, current_price: float) -> List[Trade]:
+        # Usually 0-1 open trades, so plain scalar reads beat building arrays every bar
+        exits = []
+        for row, levels in self.book.open_rows.items():
+            side = levels[0]
+            # Distance to the level in the trade's favour: <= 0 at the stop, >= 0 past the target
+            if side * (current_price - levels[3]) <= 0:
+                exits.append((row, "STOP_LOSS"))
+            elif side * (current_price - levels[4]) >= 0:
+                exits.append((row, "TAKE_PROFIT"))
+        if not exits:
+            return exits
+
         closed_trades = []
-        
-        for trade in self.open_trades[:]:
-            should_close = False
-            close_reason = ""
-            
-            if trade.signal == "BUY":
-                if current_price <= trade.stop_loss:
-                    should_close = True
-                    close_reason = "STOP_LOSS"
-                elif current_price >= trade.take_profit:
-                    should_close = True
-                    close_reason = "TAKE_PROFIT"
-            else:  # SELL
-                if current_price >= trade.stop_loss:
-                    should_close = True
-                    close_reason = "STOP_LOSS"
-                elif current_price <= trade.take_profit:
-                    should_close = True
-                    close_reason = "TAKE_PROFIT"
-            
-            if should_close:
-                self.close_trade(trade, current_price, close_reason)
-                closed_trades.append(trade)
+        for row, reason in exits:
+            trade = Trade(self.book, row)
+            self.close_trade(trade, current_price, reason)
+            closed_trades.append(trade)
                     
         return closed_trades
     
     def close_trade(self, trade: Trade, exit_price: float, reason: str):
-        trade.exit_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        trade.exit_price = exit_price
-        trade.status = reason
-        
-        # Calculate PnL
-        if trade.signal == "BUY":
-            trade.pnl = (exit_price - trade.entry_price) * trade.quantity * 10000
-        else:  # SELL
-            trade.pnl = (trade.entry_price - exit_price) * trade.quantity * 10000
-            
-        trade.pnl_percent = (trade.pnl / (trade.entry_price * trade.quantity)) * 100
+        pnl = self.book.close(trade.index, exit_price, reason)
         
         # Update account balance
-        self.account_balance += trade.pnl
+        self.account_balance += pnl
         self.equity_curve.append(self.account_balance)
         
-        # Log to PnL CSV
-        self._log_pnl(trade)
+        self._closed.append(trade.index)
         
-        self.open_trades.remove(trade)
-        self.closed_trades.append(trade)
+        # Queue for the PnL CSV; timestamps are formatted when the buffer is flushed
+        if self.pnl_file is not None:
+            self._unlogged.append(trade.index)
+            if len(self._unlogged) >= self.pnl_buffer_size:
+                self.flush_pnl()
+
+    def close_trade_manually(self, exit_price: float, reason: str = "CLOSED") -> List[Trade]:
+        """Close every open trade at exit_price"""
+        closed_trades = self.open_trades
+        for trade in closed_trades:
+            self.close_trade(trade, exit_price, reason)
+        return closed_trades
+
+    def unrealized_pnl(self, current_price: float) -> float:
+        total = 0.0
+        for side, entry_price, quantity, _, _ in self.book.open_rows.values():
+            total += side * (current_price - entry_price) * quantity
+        return total * 10000
     
     def get_performance_metrics(self) -> Dict:
-        if not self.closed_trades:
+        # Reporting points are when callers expect the CSV to be up to date
+        self.flush_pnl()
+        if not self._closed:
             return {}
             
-        winning_trades = [t for t in self.closed_trades if t.pnl and t.pnl > 0]
-        losing_trades = [t for t in self.closed_trades if t.pnl and t.pnl <= 0]
+        pnl = self.book.pnl[:self.book.size][self.book.closed_mask()]
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
         
-        total_pnl = sum(t.pnl for t in self.closed_trades if t.pnl)
-        win_rate = len(winning_trades) / len(self.closed_trades) * 100 if self.closed_trades else 0
+        total_pnl = float(pnl.sum())
+        win_rate = len(wins) / len(pnl) * 100
         
-        avg_win = sum(t.pnl for t in winning_trades) / len(winning_trades) if winning_trades else 0
-        avg_loss = sum(t.pnl for t in losing_trades) / len(losing_trades) if losing_trades else 0
+        avg_win = float(wins.mean()) if len(wins) else 0
+        avg_loss = float(losses.mean()) if len(losses) else 0
         
         return {
-            "total_trades": len(self.closed_trades),
-            "winning_trades": len(winning_trades),
-            "losing_trades": len(losing_trades),
+            "total_trades": len(pnl),
+            "winning_trades": len(wins),
+            "losing_trades": len(losses),
             "win_rate": round(win_rate, 2),
             "total_pnl": round(total_pnl, 2),
             "account_balance": round(self.account_balance, 2),
@@ -181,14 +332,6 @@ class RiskManager:
         if len(self.equity_curve) < 2:
             return 0.0
             
-        peak = self.equity_curve[0]
-        max_dd = 0.0
-        
-        for equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak * 100
-            if dd > max_dd:
-                max_dd = dd
-                
-        return max_dd
\ No newline at end of file
+        equity = np.asarray(self.equity_curve)
+        peaks = np.maximum.accumulate(equity)
+        return float(np.max((peaks - equity) / peaks * 100))
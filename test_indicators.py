@@ -0,0 +1,110 @@
+# test_indicators.py
+import numpy as np
+import pandas as pd
+import pytest
+from indicators import ema, sma, rsi, ema_np, sma_np, rsi_np, atr_np, bollinger_np, macd_np
+
+
+def _random_walk(n=500, seed=7):
+    rng = np.random.default_rng(seed)
+    return 1.18 + np.cumsum(rng.normal(0, 0.0002, n))
+
+
+def _pandas_rsi(prices, period):
+    delta = pd.Series(prices).diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return (100 - (100 / (1 + gain / loss))).fillna(50).to_numpy()
+
+
+@pytest.mark.parametrize("gaps", [[], [100], [0, 1], [250, 251, 252], [499], [10, 12, 14, 300, 301], list(range(450, 500))])
+def test_list_wrappers_match_pandas(gaps):
+    walk = _random_walk()
+    walk[gaps] = np.nan
+    prices = walk.tolist()
+    series = pd.Series(prices)
+    for period in (5, 13, 20, 64, 65, 200):
+        np.testing.assert_allclose(ema(prices, period), series.ewm(span=period, adjust=False).mean(), rtol=1e-12)
+        np.testing.assert_allclose(sma(prices, period), series.rolling(window=period).mean(), rtol=1e-12)
+        np.testing.assert_allclose(rsi(prices, period), _pandas_rsi(prices, period), atol=1e-7)
+
+
+def test_short_input_defaults():
+    assert ema([], 14) == []
+    assert ema([1.0, 2.0], 14) == [0.0, 0.0]
+    assert sma([1.0, 2.0], 14) == [0.0, 0.0]
+    assert rsi([1.0] * 14, 14) == [50.0] * 14
+
+
+def test_multi_period_rows_match_single_period():
+    prices = _random_walk()
+    periods = (3, 12, 26, 100)
+    for fn in (ema_np, sma_np, rsi_np):
+        batch = fn(prices, periods)
+        assert batch.shape == (len(periods), len(prices))
+        for row, period in zip(batch, periods):
+            np.testing.assert_allclose(row, fn(prices, period), equal_nan=True)
+
+
+def test_accepts_memoryview_without_copy():
+    prices = _random_walk()
+    view = memoryview(prices)
+    assert np.shares_memory(np.asarray(view, dtype=np.float64), prices)
+    np.testing.assert_allclose(ema_np(view, 13), ema_np(prices, 13))
+
+
+def test_rsi_flat_and_one_sided_windows():
+    assert rsi_np([1.0] * 20, 14)[-1] == 50.0
+    assert rsi_np(np.arange(20.0), 14)[-1] == 100.0
+    assert rsi_np(np.arange(20.0)[::-1], 14)[-1] == 0.0
+
+
+def test_atr_matches_wilder_smoothing():
+    close = _random_walk()
+    high = close + 0.0003
+    low = close - 0.0003
+    prev_close = pd.Series(close).shift(1)
+    true_range = pd.concat([
+        pd.Series(high - low),
+        (pd.Series(high) - prev_close).abs(),
+        (pd.Series(low) - prev_close).abs(),
+    ], axis=1).max(axis=1)
+    expected = true_range.ewm(alpha=1 / 14, adjust=False).mean()
+    np.testing.assert_allclose(atr_np(high, low, close, 14), expected, rtol=1e-12)
+
+
+def test_bollinger_matches_pandas():
+    prices = _random_walk()
+    middle, upper, lower = bollinger_np(prices, 20, num_std=2.0)
+    rolling = pd.Series(prices).rolling(window=20)
+    np.testing.assert_allclose(middle, rolling.mean(), rtol=1e-12)
+    np.testing.assert_allclose(upper - middle, 2.0 * rolling.std(ddof=0), rtol=1e-6, atol=1e-12)
+    np.testing.assert_allclose(middle - lower, upper - middle, rtol=1e-12, equal_nan=True)
+
+
+def test_bollinger_long_drifting_series():
+    rng = np.random.default_rng(11)
+    n = 500_000
+    prices = np.linspace(1.05, 1.25, n) + rng.normal(0, 0.0002, n)
+    prices[1000] = np.nan
+    middle, upper, lower = bollinger_np(prices, (20, 50))
+    for row, period in enumerate((20, 50)):
+        rolling = pd.Series(prices).rolling(window=period)
+        np.testing.assert_allclose(middle[row], rolling.mean(), rtol=1e-10)
+        np.testing.assert_allclose((upper[row] - middle[row]) / 2.0, rolling.std(ddof=0), rtol=1e-6)
+
+
+def test_macd_matches_pandas():
+    prices = _random_walk()
+    series = pd.Series(prices)
+    line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+    signal = line.ewm(span=9, adjust=False).mean()
+    macd_line, signal_line, histogram = macd_np(prices)
+    np.testing.assert_allclose(macd_line, line, atol=1e-12)
+    np.testing.assert_allclose(signal_line, signal, atol=1e-12)
+    np.testing.assert_allclose(histogram, line - signal, atol=1e-12)
+
+
+def test_rejects_non_positive_periods():
+    with pytest.raises(ValueError):
+        ema_np([1.0, 2.0], 0)
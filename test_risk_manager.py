@@ -0,0 +1,108 @@
+# test_risk_manager.py
+import csv
+import pytest
+from risk_manager import RiskManager, TradeBook
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return RiskManager(pnl_file=str(tmp_path / "pnl.csv"))
+
+
+def test_trade_view_exposes_old_fields(manager):
+    trade = manager.open_trade("BUY", 1.1800)
+    assert trade.signal == "BUY"
+    assert trade.status == "OPEN"
+    assert trade.exit_time is None and trade.pnl is None
+    assert trade.stop_loss == pytest.approx(1.1780)
+    assert trade.take_profit == pytest.approx(1.1840)
+    assert len(trade.entry_time) == len("2025-01-01 00:00:00")
+    assert manager.open_trades == [trade]
+
+
+def test_exit_conditions_close_trades(manager):
+    buy = manager.open_trade("BUY", 1.1800)
+    sell = manager.open_trade("SELL", 1.1800)
+    assert manager.check_exit_conditions(1.1780) == [buy]
+    assert buy.status == "STOP_LOSS"
+    assert buy.pnl == pytest.approx(-0.0020 * buy.quantity * 10000)
+    assert manager.open_trades == [sell]
+
+    assert manager.check_exit_conditions(1.1760) == [sell]
+    assert sell.status == "TAKE_PROFIT"
+    assert sell.pnl == pytest.approx(0.0040 * sell.quantity * 10000)
+    assert manager.open_trades == []
+    assert manager.closed_trades == [buy, sell]
+
+
+def test_metrics_and_csv(manager):
+    manager.open_trade("BUY", 1.1800)
+    manager.check_exit_conditions(1.1840)
+    manager.open_trade("BUY", 1.1840)
+    manager.check_exit_conditions(1.1820)
+    manager.open_trade("SELL", 1.1820)
+    manager.close_trade_manually(1.1800)
+
+    pnl = [t.pnl for t in manager.closed_trades]
+    metrics = manager.get_performance_metrics()
+    assert metrics["total_trades"] == 3
+    assert metrics["winning_trades"] == 2
+    assert metrics["losing_trades"] == 1
+    assert metrics["total_pnl"] == round(sum(pnl), 2)
+    assert metrics["account_balance"] == round(10000.0 + sum(pnl), 2)
+    assert metrics["max_drawdown"] > 0
+
+    with open(manager.pnl_file, newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert [row["status"] for row in rows] == ["TAKE_PROFIT", "STOP_LOSS", "CLOSED"]
+    assert all(row["exit_time"] for row in rows)
+
+
+def test_unrealized_pnl(manager):
+    assert manager.unrealized_pnl(1.18) == 0.0
+    buy = manager.open_trade("BUY", 1.1800)
+    sell = manager.open_trade("SELL", 1.1800)
+    assert manager.unrealized_pnl(1.1810) == pytest.approx(0.0010 * (buy.quantity - sell.quantity) * 10000)
+
+
+def test_trade_book_grows():
+    book = TradeBook(capacity=2)
+    rows = [book.add("BUY", 1.0 + i, 1.0, 0.5, 2.0, entry_time=float(i)) for i in range(5)]
+    book.close(rows[0], 1.5, "CLOSED")
+    assert len(book) == 5
+    assert book.entry_price[:5].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert book.closed_mask().tolist() == [True, False, False, False, False]
+
+
+def test_moved_stop_is_used_by_exit_check(manager):
+    trade = manager.open_trade("BUY", 1.1800)
+    assert manager.check_exit_conditions(1.1795) == []
+    trade.stop_loss = 1.1798
+    assert manager.check_exit_conditions(1.1795) == [trade]
+    assert trade.status == "STOP_LOSS"
+    assert manager.book.open_rows == {}
+
+
+def test_pnl_rows_are_buffered_until_flush(tmp_path):
+    manager = RiskManager(pnl_file=str(tmp_path / "pnl.csv"), pnl_buffer_size=3)
+    for _ in range(2):
+        manager.open_trade("BUY", 1.1800)
+    manager.close_trade_manually(1.1810)
+    with open(manager.pnl_file, newline='') as file:
+        assert list(csv.DictReader(file)) == []
+
+    manager.open_trade("SELL", 1.1800)
+    manager.close_trade_manually(1.1790)  # third close fills the buffer
+    with open(manager.pnl_file, newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 3
+    assert rows[0]["entry_time"] == manager.closed_trades[0].entry_time
+
+
+def test_pnl_logging_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = RiskManager(pnl_file=None)
+    manager.open_trade("BUY", 1.1800)
+    manager.close_trade_manually(1.1810)
+    assert manager.get_performance_metrics()["total_trades"] == 1
+    assert list(tmp_path.iterdir()) == []
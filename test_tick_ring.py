@@ -0,0 +1,110 @@
+# test_tick_ring.py
+import queue
+import threading
+import numpy as np
+import pytest
+from tick_ring import TickRing, TickReader
+from fanout import run_fanout, run_worker, format_stats, strategy_label
+from enhanced_strategy import EnhancedStrategy
+
+
+@pytest.fixture
+def ring():
+    ring = TickRing.create(capacity=8)
+    yield ring
+    ring.close()
+
+
+def test_readers_see_ticks_in_order(ring):
+    other = TickRing.attach(ring.name)
+    reader = TickReader(other)
+    for i in range(5):
+        ring.write(1.18 + i * 0.0001, timestamp=float(i))
+    ticks = [reader.read() for _ in range(5)]
+    assert [seq for seq, _, _ in ticks] == list(range(5))
+    assert [price for _, _, price in ticks] == pytest.approx([1.18 + i * 0.0001 for i in range(5)])
+    assert reader.read() is None
+    assert reader.overruns == 0
+    other.close()
+
+
+def test_slow_reader_detects_overrun(ring):
+    reader = TickReader(ring)
+    for i in range(20):
+        ring.write(float(i))
+    seq, _, price = reader.read()
+    assert seq == 12 and price == 12.0
+    assert reader.overruns == 1
+    assert reader.dropped == 12
+
+
+def test_lapped_slot_is_rejected(ring):
+    reader = TickReader(ring)
+    ring.write(1.0)
+    # Simulate the writer lapping the slot between the head check and the read
+    ring.seqs[0] = 8
+    assert reader.read() is None
+    assert reader.overruns == 1
+
+
+def test_ticks_stop_when_feed_closes(ring):
+    reader = TickReader(ring)
+    ring.write(1.0)
+    ring.close_feed()
+    assert [price for _, _, price in reader.ticks()] == [1.0]
+
+
+def test_fanout_matches_single_process(tmp_path):
+    rng = np.random.default_rng(3)
+    prices = (1.18 + np.cumsum(rng.normal(0, 0.0003, 400))).tolist()
+    param_sets = [
+        {"fast_period": 8, "slow_period": 21, "rsi_period": 14},
+        {"fast_period": 13, "slow_period": 20, "rsi_period": 14},
+        {"fast_period": 13, "slow_period": 34, "rsi_period": 14},
+    ]
+    results = run_fanout(param_sets=param_sets, n_workers=2, capacity=512, replay=prices,
+                         log_dir=str(tmp_path), verbose=False)
+
+    assert results["workers"] == 2
+    assert results["strategies_running"] == 3
+    assert results["ticks_processed"] == 2 * len(prices)
+    assert results["overruns"] == 0
+    for index, params in enumerate(param_sets):
+        reference = EnhancedStrategy(**params, trade_log_file=str(tmp_path / f"ref_log_{index}.csv"),
+                                     risk_params={"pnl_file": str(tmp_path / f"ref_pnl_{index}.csv")})
+        for price in prices:
+            reference.on_price(price)
+        stats = results["strategies"][index]
+        assert stats["label"] == strategy_label(params)
+        assert stats["data_points"] == len(prices)
+        assert stats.get("total_trades") == reference.get_strategy_stats().get("total_trades")
+        assert stats.get("total_pnl") == reference.get_strategy_stats().get("total_pnl")
+    assert len(list(tmp_path.glob("pnl_tracking_*.csv"))) == 3
+
+
+def test_fanout_keeps_strategies_with_duplicate_labels(tmp_path):
+    prices = (1.18 + np.cumsum(np.random.default_rng(5).normal(0, 0.0003, 200))).tolist()
+    params = {"fast_period": 8, "slow_period": 21, "rsi_period": 14}
+    results = run_fanout(param_sets=[params, params], n_workers=2, capacity=512, replay=prices,
+                         log_dir=str(tmp_path), verbose=False)
+
+    assert results["strategies_running"] == 2
+    assert sorted(results["strategies"]) == [0, 1]
+    assert {stats["worker"] for stats in results["strategies"].values()} == {0, 1}
+    assert format_stats(results).count(f"[{strategy_label(params)}]") == 2
+
+
+def test_worker_keeps_reading_after_broken_barrier(ring, tmp_path):
+    for price in (1.1, 1.2, 1.3):
+        ring.write(price)
+    ring.close_feed()
+    barrier = threading.Barrier(2)
+    barrier.abort()
+    stats_queue = queue.Queue()
+
+    run_worker(0, ring.name, [(0, {})], stats_queue, threading.Event(), ready_barrier=barrier,
+               log_dir=str(tmp_path), verbose=False)
+
+    report = stats_queue.get_nowait()
+    assert report["final"]
+    assert report["ticks"] == 3
@@ -0,0 +1,102 @@
+# test_walk_forward.py
+import numpy as np
+import pandas as pd
+import pytest
+from backtester import Backtester
+from enhanced_strategy import EnhancedStrategy
+import walk_forward
+from walk_forward import WalkForward, IndicatorCache, expand_grid, to_strategy_params
+
+GRID = {
+    "fast_period": [8, 13],
+    "slow_period": [20, 34],
+    "rsi_period": [14],
+    "stop_loss_pips": [0.0015, 0.0020],
+}
+
+
+def _history(n=1200, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 1.18 + np.cumsum(rng.normal(0, 0.0003, n))
+    return pd.DataFrame({"Close": close}, index=pd.date_range("2025-01-01", periods=n, freq="min"))
+
+
+def test_split_rolling_and_anchored():
+    assert WalkForward(train_size=400, test_size=200).split(1000) == [
+        (0, 400, 400, 600), (200, 600, 600, 800), (400, 800, 800, 1000)]
+    assert WalkForward(train_size=400, test_size=200, anchored=True).split(1000) == [
+        (0, 400, 400, 600), (0, 600, 600, 800), (0, 800, 800, 1000)]
+
+
+def test_expand_grid_skips_inverted_emas():
+    combos = expand_grid({"fast_period": [13, 34], "slow_period": [20, 34]})
+    assert combos == [{"fast_period": 13, "slow_period": 20}, {"fast_period": 13, "slow_period": 34}]
+
+
+def test_cached_backtest_matches_uncached_after_warmup():
+    data = _history()
+    params = {"fast_period": 13, "slow_period": 20, "rsi_period": 14}
+    cache = IndicatorCache(data["Close"].to_numpy(), [params])
+    plain = Backtester().run_backtest(data, to_strategy_params(params))
+    cached = Backtester().run_backtest(data, to_strategy_params(params), indicators=cache.slice(params, 0, len(data)))
+    # Same series from the same start, so only floating-point noise can differ
+    assert cached["total_trades"] == plain["total_trades"]
+    assert cached["final_balance"] == pytest.approx(plain["final_balance"])
+
+
+def test_backtest_rejects_misaligned_indicators():
+    data = _history(300)
+    params = {"fast_period": 13, "slow_period": 20, "rsi_period": 14}
+    indicators = IndicatorCache(data["Close"].to_numpy(), [params]).slice(params, 0, 10)
+    with pytest.raises(ValueError):
+        Backtester().run_backtest(data, to_strategy_params(params), indicators=indicators)
+
+
+def test_precomputed_indicators_skip_price_warmup():
+    strategy = EnhancedStrategy(fast_period=13, slow_period=55, rsi_period=14,
+                                **to_strategy_params({}))
+    assert strategy.on_price(1.18, (1.18, 1.18, float("nan"))) == []
+    signals = strategy.on_price(1.18, (1.181, 1.180, 40.0))
+    assert signals and "BUY" in signals[0]
+
+
+def test_cache_is_nan_only_at_start_of_history():
+    data = _history()
+    params = {"fast_period": 13, "slow_period": 55, "rsi_period": 14}
+    cache = IndicatorCache(data["Close"].to_numpy(), [params])
+    head = cache.slice(params, 0, 100)
+    assert np.isnan(head["slow_ema"][:55]).all() and not np.isnan(head["slow_ema"][55:]).any()
+    assert np.isnan(head["rsi"][:14]).all() and not np.isnan(head["rsi"][14:]).any()
+    window = cache.slice(params, 400, 600)
+    assert not any(np.isnan(values).any() for values in window.values())
+
+
+def test_parallel_run_matches_serial():
+    data = _history()
+    serial = WalkForward(train_size=400, test_size=200, n_jobs=1).run(data, GRID)
+    parallel = WalkForward(train_size=400, test_size=200, n_jobs=2).run(data, GRID)
+
+    assert len(serial["windows"]) == 4
+    assert [w["params"] for w in parallel["windows"]] == [w["params"] for w in serial["windows"]]
+    assert parallel["equity_curve"] == pytest.approx(serial["equity_curve"])
+    assert len(serial["equity_curve"]) == 1 + 4 * 200
+    assert serial["final_balance"] == serial["equity_curve"][-1]
+
+
+def test_minimize_picks_lowest_train_score():
+    data = _history()
+    wf = WalkForward(train_size=400, test_size=200, metric="max_drawdown", maximize=False, n_jobs=1)
+    results = wf.run(data, GRID)
+
+    combos = expand_grid(GRID)
+    for (train_start, train_end, _, _), window in zip(wf.split(len(data)), results["windows"]):
+        scores = [walk_forward._evaluate((train_start, train_end, params, wf.initial_balance, False))["max_drawdown"]
+                  for params in combos]
+        assert window["train_score"] == min(scores)
+        assert window["params"] == combos[scores.index(min(scores))]
+    assert "minimize max_drawdown" in wf.generate_report()
+
+
+def test_run_needs_enough_history():
+    with pytest.raises(ValueError):
+        WalkForward(train_size=2000, test_size=500, n_jobs=1).run(_history(1000), GRID)
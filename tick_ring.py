@@ -0,0 +1,140 @@
+# tick_ring.py - shared-memory tick ring for multi-process fan-out
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Iterator, Optional, Tuple
+
+# Header slots (int64): next sequence to be written, ring capacity, feed-closed flag
+_HEAD, _CAPACITY, _CLOSED = 0, 1, 2
+_HEADER_LEN = 4
+_EMPTY_SLOT = -1
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # Readers must not unlink the block when they exit (Python 3.13+ exposes track=False)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class TickRing:
+    """Single-writer ring of (timestamp, price) ticks living in shared memory.
+
+    Every slot carries the sequence number it was written with, so readers can tell
+    a fresh tick from one the writer has already lapped.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        buf = shm.buf
+        self._header = np.ndarray((_HEADER_LEN,), dtype=np.int64, buffer=buf)
+        self.capacity = int(self._header[_CAPACITY])
+        offset = self._header.nbytes
+        self.seqs = np.ndarray((self.capacity,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += self.seqs.nbytes
+        self.timestamps = np.ndarray((self.capacity,), dtype=np.float64, buffer=buf, offset=offset)
+        offset += self.timestamps.nbytes
+        self.prices = np.ndarray((self.capacity,), dtype=np.float64, buffer=buf, offset=offset)
+
+    @classmethod
+    def create(cls, capacity: int = 4096, name: Optional[str] = None) -> "TickRing":
+        if capacity < 1:
+            raise ValueError(f"Ring capacity must be positive, got {capacity}")
+        size = 8 * (_HEADER_LEN + 3 * capacity)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((_HEADER_LEN,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_CAPACITY] = capacity
+        del header
+        ring = cls(shm, owner=True)
+        ring.seqs[:] = _EMPTY_SLOT
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> "TickRing":
+        return cls(_attach(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def head(self) -> int:
+        """Sequence number the next tick will be written with"""
+        return int(self._header[_HEAD])
+
+    @property
+    def closed(self) -> bool:
+        return bool(self._header[_CLOSED])
+
+    def write(self, price: float, timestamp: Optional[float] = None) -> int:
+        """Publish one tick and return its sequence number (single writer only)"""
+        seq = int(self._header[_HEAD])
+        slot = seq % self.capacity
+        # Mark the slot as in-flight first so a lapped reader can't accept half a tick
+        self.seqs[slot] = _EMPTY_SLOT
+        self.timestamps[slot] = time.time() if timestamp is None else timestamp
+        self.prices[slot] = price
+        self.seqs[slot] = seq
+        self._header[_HEAD] = seq + 1
+        return seq
+
+    def close_feed(self):
+        """Tell readers no more ticks are coming"""
+        self._header[_CLOSED] = 1
+
+    def close(self):
+        # Drop the numpy views before releasing the buffer they point into
+        del self._header, self.seqs, self.timestamps, self.prices
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class TickReader:
+    """Cursor over a TickRing; each reader keeps its own position and overrun count"""
+
+    def __init__(self, ring: TickRing, from_start: bool = True):
+        self.ring = ring
+        self.next_seq = 0 if from_start else ring.head
+        self.overruns = 0
+        self.dropped = 0
+
+    def _skip_to(self, seq: int):
+        self.overruns += 1
+        self.dropped += seq - self.next_seq
+        self.next_seq = seq
+
+    def read(self) -> Optional[Tuple[int, float, float]]:
+        """Next (seq, timestamp, price), or None when caught up with the writer"""
+        ring = self.ring
+        while True:
+            head = ring.head
+            if self.next_seq >= head:
+                return None
+            if head - self.next_seq > ring.capacity:
+                self._skip_to(head - ring.capacity)
+            slot = self.next_seq % ring.capacity
+            timestamp = float(ring.timestamps[slot])
+            price = float(ring.prices[slot])
+            # Validate after reading: if the writer touched the slot meanwhile, the tick is gone
+            if ring.seqs[slot] == self.next_seq:
+                seq = self.next_seq
+                self.next_seq += 1
+                return seq, timestamp, price
+            self._skip_to(max(self.next_seq + 1, ring.head - ring.capacity))
+
+    def ticks(self, poll_interval: float = 0.001, stop_event=None) -> Iterator[Tuple[int, float, float]]:
+        """Yield ticks until the feed is closed and fully drained, or stop_event is set"""
+        while True:
+            tick = self.read()
+            if tick is not None:
+                yield tick
+                continue
+            if self.ring.closed and self.next_seq >= self.ring.head:
+                return
+            if stop_event is not None and stop_event.is_set():
+                return
+            time.sleep(poll_interval)
@@ -0,0 +1,219 @@
+# walk_forward.py - parallel walk-forward optimization on top of Backtester
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from backtester import Backtester
+from indicators import ema_np, rsi_np
+
+RISK_PARAMS = ("risk_per_trade", "stop_loss_pips", "take_profit_pips")
+
+DEFAULT_PARAM_GRID: Dict[str, List[Any]] = {
+    "fast_period": [8, 13, 21],
+    "slow_period": [20, 34, 55],
+    "rsi_period": [14],
+    "stop_loss_pips": [0.0015, 0.0020],
+    "take_profit_pips": [0.0030, 0.0040],
+}
+
+Window = Tuple[int, int, int, int]  # train_start, train_end, test_start, test_end (end exclusive)
+
+
+def expand_grid(param_grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """All parameter combinations, skipping ones where the fast EMA isn't faster than the slow one"""
+    keys = list(param_grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(param_grid[k] for k in keys))]
+    return [c for c in combos if c.get("fast_period", 13) < c.get("slow_period", 20)]
+
+
+def to_strategy_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Split a flat parameter set into EnhancedStrategy kwargs with nested risk_params"""
+    strategy_params = {k: v for k, v in params.items() if k not in RISK_PARAMS}
+    risk_params = {k: v for k, v in params.items() if k in RISK_PARAMS}
+    # Optimization runs would otherwise all truncate and append to the same CSV files
+    risk_params["pnl_file"] = None
+    strategy_params["risk_params"] = risk_params
+    strategy_params["trade_log_file"] = os.devnull
+    return strategy_params
+
+
+class IndicatorCache:
+    """Indicator series computed once over the full history and sliced per window.
+
+    Overlapping train/test windows share these arrays instead of each backtest
+    recomputing EMAs and RSI from scratch on every tick. Indicators are therefore
+    already warm at the start of each window, and EnhancedStrategy can trade from a
+    window's first bar. Only the first `period` bars of the whole history are NaN,
+    which reproduces the strategy's usual warm-up there.
+    """
+
+    def __init__(self, close: np.ndarray, combos: Sequence[Dict[str, Any]]):
+        ema_periods = sorted({c.get("fast_period", 13) for c in combos} | {c.get("slow_period", 20) for c in combos})
+        rsi_periods = sorted({c.get("rsi_period", 14) for c in combos})
+        self.ema = dict(zip(ema_periods, ema_np(close, ema_periods)))
+        self.rsi = dict(zip(rsi_periods, rsi_np(close, rsi_periods)))
+        for cache in (self.ema, self.rsi):
+            for period, values in cache.items():
+                values[:period] = np.nan
+
+    def slice(self, params: Dict[str, Any], start: int, end: int) -> Dict[str, np.ndarray]:
+        return {
+            "fast_ema": self.ema[params.get("fast_period", 13)][start:end],
+            "slow_ema": self.ema[params.get("slow_period", 20)][start:end],
+            "rsi": self.rsi[params.get("rsi_period", 14)][start:end],
+        }
+
+
+# Per-process state, set once by _init_worker so tasks only carry window bounds and params
+_history: Optional[pd.DataFrame] = None
+_cache: Optional[IndicatorCache] = None
+
+
+def _init_worker(history: pd.DataFrame, cache: IndicatorCache):
+    global _history, _cache
+    _history = history
+    _cache = cache
+
+
+def _evaluate(task: Tuple[int, int, Dict[str, Any], float, bool]) -> Dict[str, Any]:
+    start, end, params, initial_balance, keep_curve = task
+    backtester = Backtester(initial_balance=initial_balance)
+    result = backtester.run_backtest(_history.iloc[start:end], to_strategy_params(params),
+                                     indicators=_cache.slice(params, start, end), close_at_end=True)
+    if not keep_curve:
+        # Training runs only need the metrics; don't ship curves back to the parent
+        result.pop('equity_curve')
+        result.pop('trades')
+    return result
+
+
+class WalkForward:
+    """Optimize on each train window, then trade the best parameters on the following test window.
+
+    `metric` is the backtest result key used to rank parameter sets on a train window.
+    With `maximize=True` the highest value wins; pass `maximize=False` for metrics where
+    lower is better, such as "max_drawdown".
+    """
+
+    def __init__(self, train_size: int = 2000, test_size: int = 500, step: Optional[int] = None,
+                 anchored: bool = False, initial_balance: float = 10000.0,
+                 metric: str = "total_return", maximize: bool = True, n_jobs: Optional[int] = None):
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step = step or test_size
+        self.anchored = anchored
+        self.initial_balance = initial_balance
+        self.metric = metric
+        self.maximize = maximize
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.results = {}
+
+    def split(self, n_bars: int) -> List[Window]:
+        """Rolling (or anchored) train/test windows; each test window follows its train window"""
+        windows = []
+        train_start, train_end = 0, self.train_size
+        while train_end + self.test_size <= n_bars:
+            windows.append((train_start, train_end, train_end, train_end + self.test_size))
+            train_end += self.step
+            if not self.anchored:
+                train_start += self.step
+        return windows
+
+    def _map(self, pool: Optional[ProcessPoolExecutor], tasks: List[Tuple]) -> List[Dict[str, Any]]:
+        if pool is None:
+            return [_evaluate(task) for task in tasks]
+        return list(pool.map(_evaluate, tasks, chunksize=max(1, len(tasks) // (4 * self.n_jobs))))
+
+    def run(self, historical_data: pd.DataFrame, param_grid: Optional[Dict[str, Sequence[Any]]] = None) -> Dict[str, Any]:
+        combos = expand_grid(param_grid or DEFAULT_PARAM_GRID)
+        if not combos:
+            raise ValueError("Parameter grid has no valid combinations")
+        windows = self.split(len(historical_data))
+        if not windows:
+            raise ValueError(f"Need at least {self.train_size + self.test_size} bars, got {len(historical_data)}")
+
+        history = historical_data[['Close']]
+        cache = IndicatorCache(history['Close'].to_numpy(dtype=np.float64), combos)
+
+        pool = None
+        if self.n_jobs > 1:
+            # Workers receive the history and indicator cache once, not with every task
+            pool = ProcessPoolExecutor(max_workers=self.n_jobs,
+                                       initializer=_init_worker, initargs=(history, cache))
+        else:
+            _init_worker(history, cache)
+
+        try:
+            # Every (window, combo) training run is independent, so schedule them all at once
+            train_tasks = [(train_start, train_end, params, self.initial_balance, False)
+                           for train_start, train_end, _, _ in windows for params in combos]
+            train_results = self._map(pool, train_tasks)
+
+            best_params = []
+            for w in range(len(windows)):
+                scores = [r.get(self.metric, 0) for r in train_results[w * len(combos):(w + 1) * len(combos)]]
+                best = int(np.argmax(scores) if self.maximize else np.argmin(scores))
+                best_params.append((combos[best], scores[best]))
+
+            # Test windows are evaluated from the same balance and compounded afterwards
+            test_tasks = [(test_start, test_end, params, self.initial_balance, True)
+                          for (_, _, test_start, test_end), (params, _) in zip(windows, best_params)]
+            test_results = self._map(pool, test_tasks)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        balance = self.initial_balance
+        equity_curve = [balance]
+        window_reports = []
+        for (train_start, train_end, test_start, test_end), (params, score), result in zip(windows, best_params, test_results):
+            growth = np.asarray(result['equity_curve'][1:]) / self.initial_balance
+            equity_curve.extend((balance * growth).tolist())
+            balance = equity_curve[-1]
+            window_reports.append({
+                "train_start": historical_data.index[train_start],
+                "train_end": historical_data.index[train_end - 1],
+                "test_start": historical_data.index[test_start],
+                "test_end": historical_data.index[test_end - 1],
+                "params": params,
+                "train_score": score,
+                "test_return": result.get('total_return', 0),
+                "test_trades": result.get('total_trades', 0),
+                "test_win_rate": result.get('win_rate', 0),
+            })
+
+        self.results = {
+            "windows": window_reports,
+            "equity_curve": equity_curve,
+            "final_balance": balance,
+            "total_return": (balance - self.initial_balance) / self.initial_balance * 100,
+            "total_trades": sum(w["test_trades"] for w in window_reports),
+        }
+        return self.results
+
+    def generate_report(self) -> str:
+        if not self.results:
+            return "No walk-forward results available."
+
+        lines = [
+            "",
+            "🔁 WALK-FORWARD REPORT",
+            "=" * 50,
+            f"Mode: {'Anchored' if self.anchored else 'Rolling'} | Train: {self.train_size} bars | "
+            f"Test: {self.test_size} bars | Step: {self.step} bars",
+            f"Selection: {'maximize' if self.maximize else 'minimize'} {self.metric}",
+            f"Initial Balance: ${self.initial_balance:,.2f}",
+            f"Out-of-Sample Final Balance: ${self.results['final_balance']:,.2f}",
+            f"Out-of-Sample Return: {self.results['total_return']:.2f}%",
+            f"Out-of-Sample Trades: {self.results['total_trades']}",
+            "",
+            "📅 WINDOWS",
+        ]
+        for i, w in enumerate(self.results["windows"], 1):
+            params = ", ".join(f"{k}={v}" for k, v in w["params"].items())
+            lines.append(f"{i:>3}. {w['test_start']} → {w['test_end']} | Train {self.metric}: {w['train_score']:.2f} | "
+                         f"Test Return: {w['test_return']:.2f}% | Trades: {w['test_trades']} | {params}")
+        return "\n".join(lines)